@@ -0,0 +1,132 @@
+# File: scripts/load_test.py
+# Purpose: Load-tests the recognition service against local stand-ins for ACRCloud and Spotify.
+#
+# Usage: python scripts/load_test.py --requests 500 --concurrency 64 --workers 4 --queue 16
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import aiohttp
+import numpy as np
+import soundfile as sf
+from aiohttp import web
+
+from shazamify.server import create_app
+from shazamify.services.recognition_pipeline import RecognitionPipeline
+
+SONGS = [f"Stand-in Artist {i} - Stand-in Song {i}" for i in range(50)]
+
+
+class StandInRecognitionClient:
+    """Mimics RecognitionClient: blocks for a network-like delay, then names a song."""
+
+    def __init__(self, latency, miss_rate):
+        self.latency = latency
+        self.miss_rate = miss_rate
+
+    def identify_song_pcm(self, x, fs, rec_duration=10):
+        time.sleep(random.uniform(0.5, 1.5) * self.latency)
+        if random.random() < self.miss_rate:
+            return None
+        return random.choice(SONGS)
+
+
+class StandInSpotifyClient:
+    """Mimics SpotifyClient.get_enriched_details (search + artist_albums)."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def get_enriched_details(self, song_title):
+        time.sleep(2 * random.uniform(0.5, 1.5) * self.latency)  # two API calls
+        artist, _, title = song_title.partition(" - ")
+        return {
+            "song_name": title,
+            "artist(s)": artist,
+            "artist_id": f"stand-in-{abs(hash(artist)) % 10**8}",
+            "album_name": f"{title} (Album)",
+            "album_art_url": "",
+            "top_albums": [f"{artist} Album {i}" for i in range(3)],
+        }
+
+
+def make_wav(seconds=7, fs=16000):
+    x = 0.1 * np.random.default_rng(0).standard_normal(int(seconds * fs)).astype(np.float32)
+    buf = io.BytesIO()
+    sf.write(buf, x, fs, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+async def run_load(url, n_requests, concurrency, payload):
+    statuses = {}
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async with aiohttp.ClientSession() as session:
+        async def one():
+            async with sem:
+                t0 = time.monotonic()
+                async with session.post(f"{url}/recognize", data=payload,
+                                        headers={"Content-Type": "audio/wav"}) as resp:
+                    await resp.read()
+                    statuses[resp.status] = statuses.get(resp.status, 0) + 1
+                    if resp.status == 200:
+                        latencies.append(time.monotonic() - t0)
+
+        t_start = time.monotonic()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        elapsed = time.monotonic() - t_start
+
+        async with session.get(f"{url}/metrics") as resp:
+            metrics = await resp.json()
+
+    return statuses, sorted(latencies), elapsed, metrics
+
+
+async def main(args):
+    pipeline = RecognitionPipeline(
+        size=args.workers,
+        recognition_factory=lambda: StandInRecognitionClient(args.recognition_latency, args.miss_rate),
+        spotify_factory=lambda: StandInSpotifyClient(args.spotify_latency),
+    )
+    app = create_app(pipeline, workers=args.workers, max_queue=args.queue)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+
+    try:
+        statuses, lat, elapsed, metrics = await run_load(
+            f"http://127.0.0.1:{args.port}", args.requests, args.concurrency, make_wav()
+        )
+    finally:
+        await runner.cleanup()
+
+    ok = statuses.get(200, 0)
+    print(f"Sent {args.requests} requests ({args.concurrency} concurrent) in {elapsed:.2f}s")
+    print(f"Status counts: {statuses}")
+    print(f"Throughput: {ok / elapsed:.1f} successful req/s")
+    if lat:
+        print(f"Latency p50 {lat[len(lat) // 2] * 1000:.0f} ms, "
+              f"p95 {lat[int(len(lat) * 0.95)] * 1000:.0f} ms, max {lat[-1] * 1000:.0f} ms")
+    print(f"Service metrics: {metrics}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load-test the recognition service with stand-in APIs.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=16)
+    parser.add_argument("--recognition-latency", type=float, default=0.3, help="seconds per ACRCloud call")
+    parser.add_argument("--spotify-latency", type=float, default=0.1, help="seconds per Spotify call")
+    parser.add_argument("--miss-rate", type=float, default=0.1, help="fraction of clips that go unidentified")
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
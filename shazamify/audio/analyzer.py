@@ -68,11 +68,21 @@ def generate_chromagram(x, fs, out_dir="data/plots", stem="clip"):
     plt.close()
     return path
 
-def generate_spectrogram(x, fs, out_dir="data/plots", stem="clip"):
+def stft_db(x):
+    """Log-magnitude STFT (dB relative to the peak) used by the spectrogram plot."""
+    X_stft = librosa.stft(x)
+    return librosa.amplitude_to_db(np.abs(X_stft), ref=np.max).astype(np.float32)
+
+def mel_db(x, fs):
+    """Log-power mel spectrogram (dB relative to the peak) used by the mel plot."""
+    S = librosa.feature.melspectrogram(y=x, sr=fs, n_mels=128, fmax=fs / 2)
+    return librosa.power_to_db(S, ref=np.max).astype(np.float32)
+
+def generate_spectrogram(x, fs, out_dir="data/plots", stem="clip", Xdb=None):
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     plt.figure()
-    X_stft = librosa.stft(x)
-    Xdb = librosa.amplitude_to_db(np.abs(X_stft), ref=np.max)
+    if Xdb is None:
+        Xdb = stft_db(x)
     librosa.display.specshow(Xdb, sr=fs, x_axis='time', y_axis='log')
     plt.colorbar(format='%+2.0f dB')
     plt.title('Spectrogram')
@@ -81,13 +91,13 @@ def generate_spectrogram(x, fs, out_dir="data/plots", stem="clip"):
     plt.close()
     return path
 
-def generate_mel_spectrogram(x, fs, out_dir="data/plots", stem="clip"):
+def generate_mel_spectrogram(x, fs, out_dir="data/plots", stem="clip", S_dB=None):
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     plt.figure()
     # Compute Mel Spectrogram
-    S = librosa.feature.melspectrogram(y=x, sr=fs, n_mels=128, fmax=8000)
-    S_dB = librosa.power_to_db(S, ref=np.max)
-    librosa.display.specshow(S_dB, x_axis='time', y_axis='mel', sr=fs, fmax=8000)
+    if S_dB is None:
+        S_dB = mel_db(x, fs)
+    librosa.display.specshow(S_dB, x_axis='time', y_axis='mel', sr=fs, fmax=fs / 2)
     plt.colorbar(format='%+2.0f dB')
     plt.title('Mel-frequency Spectrogram')
     path = f"{out_dir}/{stem}_mel.png"
@@ -107,4 +117,40 @@ def generate_tempogram(x, fs, out_dir="data/plots", stem="clip"):
     path = f"{out_dir}/{stem}_tempogram.png"
     plt.savefig(path, dpi=100, bbox_inches="tight")
     plt.close()
-    return path
\ No newline at end of file
+    return path
+
+def feature_summary(x, fs):
+    """Cheap per-clip statistics that are stored in the recording archive index."""
+    if len(x) == 0:
+        return {}
+    f, mag_db = magnitude_spectrum(x, fs)
+    power = 10 ** (mag_db / 10)
+    return {
+        "rms": round(float(np.sqrt(np.mean(np.square(x)))), 5),
+        "peak": round(float(np.max(np.abs(x))), 5),
+        "spectral_centroid_hz": round(float(np.sum(f * power) / np.sum(power)), 1),
+        "dominant_hz": round(float(f[np.argmax(mag_db)]), 1),
+    }
+
+# 32 mel bands (mean + std), 12 chroma bins (mean + std) and tempo.
+EMBEDDING_DIM = 32 * 2 + 12 * 2 + 1
+
+def clip_embedding(x, fs):
+    """
+    Fixed-size, L2-normalized float32 descriptor of a clip for similarity search.
+    Mel bands stop at 8 kHz so clips captured at different rates stay comparable.
+    """
+    S = librosa.feature.melspectrogram(y=x, sr=fs, n_mels=32, fmax=min(8000, fs / 2))
+    S_dB = librosa.power_to_db(S, ref=np.max)
+    chroma = librosa.feature.chroma_stft(y=x, sr=fs)
+    oenv = librosa.onset.onset_strength(y=x, sr=fs)
+    tempo = librosa.feature.tempo(onset_envelope=oenv, sr=fs)[0]
+
+    v = np.concatenate([
+        S_dB.mean(axis=1) / 80.0,
+        S_dB.std(axis=1) / 20.0,
+        chroma.mean(axis=1),
+        chroma.std(axis=1),
+        [np.log2(max(tempo, 1.0) / 120.0)],
+    ]).astype(np.float32)
+    return v / max(float(np.linalg.norm(v)), 1e-12)
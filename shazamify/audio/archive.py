@@ -0,0 +1,285 @@
+# File: shazamify/audio/archive.py
+# Purpose: Keeps every capture as a compressed FLAC/Opus file with a compact JSON-lines index.
+
+import json
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+from scipy.signal import resample_poly
+
+from .analyzer import feature_summary, clip_embedding
+from .similarity import SimilarityIndex
+
+# Opus only supports these sample rates; anything else is resampled to 48 kHz.
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+# The writer saves embeddings.npz once it runs out of work, or after this many new embeddings.
+SAVE_EVERY = 32
+
+
+class RecordingArchive:
+    """
+    Stores recordings on disk without blocking the caller.
+
+    `submit()` returns a clip id straight away and hands the samples to a
+    background thread, which encodes them and computes a feature summary.
+    The index (`index.jsonl`) is append-only: every change to an entry is
+    written as a new line and later lines override earlier ones on load.
+    Each clip's embedding also goes into a SimilarityIndex
+    (`embeddings.npz`) for "sounds like" lookups; the writer saves it
+    whenever it goes idle. Clips with a recognized song are marked in the
+    index so lookups can be limited to them.
+    """
+
+    def __init__(self, root="data/archive", fmt="flac"):
+        self.fmt = fmt.lower()
+        if self.fmt not in ("flac", "opus"):
+            raise ValueError(f"Unsupported archive format '{fmt}'.")
+
+        self.root = Path(root)
+        self.clips_dir = self.root / "clips"
+        self.clips_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.jsonl"
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pending = {}  # clip_id -> samples not yet written to disk
+        self._songs = {}  # clip_id -> recognized song name
+        self._clips_by_song = {}  # song name -> set of clip ids
+        self._load_index()
+
+        self.embeddings_path = self.root / "embeddings.npz"
+        self.similarity = SimilarityIndex.open(self.embeddings_path)
+        self._unsaved = 0  # embeddings added since the last save
+        for clip_id in self._songs:
+            self.similarity.mark(clip_id)
+
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="archive-writer", daemon=True)
+        self._worker.start()
+
+        # Backfill embeddings that were not saved before a crash.
+        for clip_id, entry in self._entries.items():
+            if entry.get("status") == "ready" and self.similarity.vector(clip_id) is None:
+                self._queue.put(("embed", clip_id))
+
+    # --- PUBLIC API ---
+    def submit(self, x, fs, result=None) -> str:
+        """Queues a clip for encoding and returns its id."""
+        x = np.asarray(x, dtype=np.float32)
+        clip_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        entry = {
+            "id": clip_id,
+            "timestamp": time.time(),
+            "duration": round(len(x) / fs, 3),
+            "fs": int(fs),
+            "path": None,
+            "result": result,
+            "features": None,
+            "status": "pending",
+        }
+        with self._lock:
+            self._entries[clip_id] = entry
+            self._pending[clip_id] = x
+            self._append(entry)
+            self._set_song(clip_id, result)
+        self._queue.put(("encode", clip_id))
+        return clip_id
+
+    def set_result(self, clip_id, result):
+        """Attaches a recognition result to an archived clip."""
+        with self._lock:
+            entry = self._entries.get(clip_id)
+            if entry is None:
+                return
+            entry["result"] = result
+            self._append({"id": clip_id, "result": result})
+            self._set_song(clip_id, result)
+            self.similarity.mark(clip_id, clip_id in self._songs)
+
+    def get(self, clip_id) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(clip_id)
+            return dict(entry) if entry else None
+
+    def entries(self) -> list:
+        """Returns copies of all index entries, newest first."""
+        with self._lock:
+            entries = [dict(e) for e in self._entries.values() if e["status"] != "lost"]
+        return sorted(entries, key=lambda e: e["timestamp"], reverse=True)
+
+    def read(self, clip_id, start=0.0, stop=None):
+        """
+        Returns (fs, x) for a clip, decoding only the frames between `start`
+        and `stop` (in seconds).
+        """
+        with self._lock:
+            entry = self._entries.get(clip_id)
+            pending = self._pending.get(clip_id)
+        if entry is None:
+            raise KeyError(clip_id)
+
+        if pending is not None:
+            # Still waiting for the writer thread; serve the samples from memory.
+            fs = entry["fs"]
+            a = int(start * fs)
+            b = len(pending) if stop is None else int(stop * fs)
+            return fs, pending[a:b]
+
+        with sf.SoundFile(str(self.root / entry["path"])) as f:
+            a = min(int(start * f.samplerate), f.frames)
+            b = f.frames if stop is None else min(int(stop * f.samplerate), f.frames)
+            f.seek(a)
+            x = f.read(max(b - a, 0), dtype="float32", always_2d=True)
+            return f.samplerate, x[:, 0]
+
+    def song_name(self, clip_id):
+        """The song a clip was recognized as, or None."""
+        with self._lock:
+            return self._songs.get(clip_id)
+
+    def clips_of(self, song_name) -> set:
+        """Ids of every clip recognized as `song_name`."""
+        with self._lock:
+            return set(self._clips_by_song.get(song_name, ()))
+
+    def similar(self, clip_id, k=5, exclude=(), identified_only=False) -> list:
+        """
+        Returns up to k (entry, score) pairs for the archived clips that sound
+        most like `clip_id`, skipping `exclude` and, with `identified_only`,
+        clips without a recognized song. A clip the writer has not reached
+        yet is embedded from its in-memory samples rather than waiting for
+        the queue.
+        """
+        with self._lock:
+            entry = self._entries.get(clip_id)
+            pending = self._pending.get(clip_id)
+        vector = self.similarity.vector(clip_id)
+        if vector is None:
+            if pending is None:
+                return []
+            vector = self._embed(clip_id, pending, entry["fs"])
+
+        matches = []
+        hits = self.similarity.query(vector, k=k, exclude=[clip_id, *exclude], marked_only=identified_only)
+        for other_id, score in hits:
+            entry = self.get(other_id)
+            if entry and entry["status"] == "ready":
+                matches.append((entry, score))
+        return matches
+
+    def flush(self):
+        """Blocks until every submitted clip has been written."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+        if self._unsaved:
+            self._save_embeddings()
+
+    # --- BACKGROUND WRITER ---
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                task, clip_id = job
+                if task == "encode":
+                    self._encode(clip_id)
+                elif clip_id not in self.similarity:
+                    fs, x = self.read(clip_id)
+                    self._embed(clip_id, x, fs)
+                if self._unsaved >= SAVE_EVERY or (self._unsaved and self._queue.empty()):
+                    self._save_embeddings()
+            except Exception as e:
+                print(f"Error archiving clip {job[1]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _embed(self, clip_id, x, fs):
+        """Computes a clip's embedding and adds it to the index unless another thread already has."""
+        vector = clip_embedding(x, fs)
+        with self._lock:
+            if clip_id not in self.similarity:
+                self.similarity.add(clip_id, vector, marked=clip_id in self._songs)
+                self._unsaved += 1
+        return vector
+
+    def _save_embeddings(self):
+        with self._lock:
+            self._unsaved = 0
+        self.similarity.save(self.embeddings_path)
+
+    def _encode(self, clip_id):
+        with self._lock:
+            fs = self._entries[clip_id]["fs"]
+            x = self._pending[clip_id]
+
+        features = feature_summary(x, fs)
+        try:
+            if clip_id not in self.similarity:
+                self._embed(clip_id, x, fs)
+        except Exception as e:
+            print(f"Could not compute embedding for clip {clip_id}: {e}")
+
+        y = np.clip(x, -1.0, 1.0)
+        if self.fmt == "opus":
+            rate = fs if fs in OPUS_RATES else 48000
+            if rate != fs:
+                y = resample_poly(y, rate, fs).astype(np.float32)
+            rel_path = f"clips/{clip_id}.opus"
+            sf.write(str(self.root / rel_path), y, rate, format="OGG", subtype="OPUS")
+        else:
+            rel_path = f"clips/{clip_id}.flac"
+            sf.write(str(self.root / rel_path), y, fs, format="FLAC", subtype="PCM_16")
+
+        update = {"id": clip_id, "path": rel_path, "features": features, "status": "ready"}
+        with self._lock:
+            self._entries[clip_id].update(update)
+            self._pending.pop(clip_id, None)
+            self._append(update)
+
+    # --- INDEX ---
+    def _set_song(self, clip_id, result):
+        """Updates the clip -> song lookups for a new result. Callers must hold the lock."""
+        old = self._songs.pop(clip_id, None)
+        if old is not None:
+            self._clips_by_song[old].discard(clip_id)
+            if not self._clips_by_song[old]:
+                del self._clips_by_song[old]
+        name = (result or {}).get("song_name")
+        if name:
+            self._songs[clip_id] = name
+            self._clips_by_song.setdefault(name, set()).add(clip_id)
+
+    def _append(self, record):
+        """Appends one index line. Callers must hold the lock."""
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a torn final line from an interrupted write
+                self._entries.setdefault(record["id"], {}).update(record)
+
+        # Clips that never finished encoding in a previous session are gone.
+        for clip_id, entry in self._entries.items():
+            if entry.get("status") == "pending":
+                entry["status"] = "lost"
+            self._set_song(clip_id, entry.get("result"))
@@ -0,0 +1,249 @@
+# File: shazamify/audio/multi_capture.py
+# Purpose: Captures several input devices at once and recognizes each on a shared, fair worker pool.
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import sounddevice as sd
+
+from .. import config
+from .analyzer import feature_summary
+from .resampler import StreamingResampler, native_rate
+
+
+class RingBuffer:
+    """Fixed-size float32 ring holding the most recent samples of one stream."""
+
+    def __init__(self, capacity):
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self.total_written = 0
+        self._lock = threading.Lock()
+
+    def write(self, block):
+        with self._lock:
+            n = len(block)
+            if n > self.capacity:
+                # Only the newest `capacity` samples survive; write them where they would have landed.
+                self.total_written += n - self.capacity
+                block = block[-self.capacity:]
+                n = self.capacity
+            start = self.total_written % self.capacity
+            first = min(n, self.capacity - start)
+            self._buf[start:start + first] = block[:first]
+            self._buf[:n - first] = block[first:]
+            self.total_written += n
+
+    def latest(self, n) -> np.ndarray:
+        """Returns a copy of the newest `n` samples (fewer if not yet written)."""
+        with self._lock:
+            n = min(n, self.capacity, self.total_written)
+            end = self.total_written % self.capacity
+            if n <= end:
+                return self._buf[end - n:end].copy()
+            return np.concatenate((self._buf[self.capacity - (n - end):], self._buf[:end]))
+
+
+class CaptureStream:
+    """One input device with its own ring buffer, recognition state and counters."""
+
+    def __init__(self, name, device=None, fs=None, ring_seconds=20):
+        self.name = name
+        self.device = device
+        self.fs = fs or native_rate(device)
+        self.ring = RingBuffer(int(ring_seconds * self.fs))
+        self.stream = None
+        self.started_at = None
+
+        self.state = {"status": "idle", "song_details": None, "features": None, "updated": None}
+        self.stats = {
+            "overflows": 0,       # blocks PortAudio dropped before we saw them
+            "jobs_submitted": 0,
+            "jobs_completed": 0,
+            "jobs_dropped": 0,    # replaced by a newer job before a worker was free
+            "busy_seconds": 0.0,  # worker time spent on this stream
+        }
+
+    def start(self):
+        self.stream = sd.InputStream(samplerate=self.fs, device=self.device, channels=1,
+                                     dtype="float32", callback=self._callback)
+        self.started_at = time.monotonic()
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.stats["overflows"] += 1
+        self.ring.write(indata[:, 0])
+
+
+class FairScheduler:
+    """
+    Bounded worker pool shared by every stream.
+
+    Each stream has a single job slot: submitting while a job is still
+    waiting replaces it (the newer audio is more useful) and counts a drop.
+    A dispatcher hands free workers to streams in round-robin order and never
+    runs two jobs for the same stream at once, so a busy room cannot starve
+    the others.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="monitor")
+        self._slots = threading.Semaphore(workers)
+        self._cond = threading.Condition()
+        self._waiting = {}     # stream name -> (stream, fn)
+        self._order = deque()  # round-robin order of stream names
+        self._running = set()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._dispatch, name="monitor-dispatch", daemon=True)
+        self._thread.start()
+
+    def submit(self, stream, fn):
+        with self._cond:
+            if stream.name in self._waiting:
+                stream.stats["jobs_dropped"] += 1
+            elif stream.name not in self._order:
+                self._order.append(stream.name)
+            self._waiting[stream.name] = (stream, fn)
+            stream.stats["jobs_submitted"] += 1
+            self._cond.notify()
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._waiting)
+
+    def in_flight(self) -> int:
+        with self._cond:
+            return len(self._running)
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _dispatch(self):
+        while True:
+            self._slots.acquire()
+            with self._cond:
+                while not self._stopped and self._next_ready() is None:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                name = self._next_ready()
+                self._order.remove(name)
+                self._order.append(name)
+                stream, fn = self._waiting.pop(name)
+                self._running.add(name)
+            self._executor.submit(self._run, stream, fn)
+
+    def _next_ready(self):
+        for name in self._order:
+            if name in self._waiting and name not in self._running:
+                return name
+        return None
+
+    def _run(self, stream, fn):
+        t0 = time.monotonic()
+        try:
+            fn()
+        except Exception as e:
+            print(f"Error in monitor job for '{stream.name}': {e}")
+        finally:
+            with self._cond:
+                self._running.discard(stream.name)
+                stream.stats["jobs_completed"] += 1
+                stream.stats["busy_seconds"] += time.monotonic() - t0
+                self._cond.notify()
+            self._slots.release()
+
+
+class MultiRoomMonitor:
+    """
+    Listens to several rooms at once. Every `interval` seconds the latest
+    `clip_seconds` of each room are queued for analysis and, unless the room
+    is silent, recognition through a shared RecognitionPipeline.
+    `on_result(name, state)` is called from a worker thread after each job.
+    """
+
+    def __init__(self, devices, pipeline, workers=config.MONITOR_WORKERS,
+                 interval=config.MONITOR_INTERVAL, clip_seconds=config.MONITOR_CLIP_SECONDS,
+                 on_result=None):
+        self.streams = {name: CaptureStream(name, device) for name, device in devices.items()}
+        self.pipeline = pipeline
+        self.interval = interval
+        self.clip_seconds = clip_seconds
+        self.on_result = on_result
+        self.scheduler = FairScheduler(workers)
+        self._stop = threading.Event()
+        self._ticker = None
+
+    def start(self):
+        for stream in self.streams.values():
+            stream.start()
+        self._ticker = threading.Thread(target=self._tick, name="monitor-ticker", daemon=True)
+        self._ticker.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._ticker:
+            self._ticker.join()
+        for stream in self.streams.values():
+            stream.stop()
+        self.scheduler.shutdown()
+
+    def stats(self) -> dict:
+        """Per-stream throughput and drop counters, plus the shared pool's load."""
+        report = {
+            "workers": self.scheduler.workers,
+            "queue_depth": self.scheduler.queue_depth(),
+            "in_flight": self.scheduler.in_flight(),
+            "streams": {},
+        }
+        for name, s in self.streams.items():
+            elapsed = max(time.monotonic() - (s.started_at or time.monotonic()), 1e-9)
+            report["streams"][name] = {
+                "fs": s.fs,
+                "realtime_ratio": round(s.ring.total_written / s.fs / elapsed, 3),
+                "jobs_per_min": round(60 * s.stats["jobs_completed"] / elapsed, 2),
+                "avg_job_s": round(s.stats["busy_seconds"] / max(s.stats["jobs_completed"], 1), 2),
+                **s.stats,
+                "status": s.state["status"],
+            }
+        return report
+
+    def _tick(self):
+        while not self._stop.wait(self.interval):
+            for stream in self.streams.values():
+                x = stream.ring.latest(int(self.clip_seconds * stream.fs))
+                if len(x) < stream.fs:
+                    continue  # less than a second captured so far
+                self.scheduler.submit(stream, lambda s=stream, x=x: self._process(s, x))
+
+    def _process(self, stream, x):
+        features = feature_summary(x, stream.fs)
+        stream.state.update(features=features, updated=time.time())
+
+        if features["rms"] < config.MONITOR_SILENCE_RMS:
+            stream.state["status"] = "silent"
+        else:
+            stream.state["status"] = "recognizing"
+            fs = config.RECOGNITION_RATE
+            if stream.fs != fs:
+                x = StreamingResampler(stream.fs, fs).process(x)
+            details = self.pipeline.recognize(x, fs, rec_duration=int(self.clip_seconds))
+            stream.state.update(song_details=details, status="done" if "error" not in details else "no match")
+
+        if self.on_result:
+            self.on_result(stream.name, dict(stream.state))
@@ -1,40 +1,104 @@
 # File: shazamify/audio/recorder.py
 # Purpose: Handles threaded, non-blocking audio recording.
 
+import queue
+
 import numpy as np
 import sounddevice as sd
 from scipy.io.wavfile import write
 from pathlib import Path
-import time
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from .resampler import ResamplingFanout, native_rate
+from .tempo_tracker import TempoTracker
+from .. import config
+
+
 class Recorder(QObject):
-    """A worker object that records audio in a separate thread."""
+    """
+    A worker object that records audio in a separate thread.
+
+    Capture runs at the device's native rate (unless `fs` is given) so the
+    audio stack never has to resample. `streams` maps extra output names to
+    sample rates; those are produced block by block by a streaming resampler
+    while recording, and returned alongside the full-rate clip. With
+    `track_tempo`, a TempoTracker follows the live audio and its estimates
+    are emitted while recording is still in progress.
+    """
     progress = pyqtSignal(int)
-    finished = pyqtSignal(tuple)
+    finished = pyqtSignal(tuple)  # (fs, x, {name: (rate, samples)})
+    tempo_changed = pyqtSignal(float)  # bpm
+    beat = pyqtSignal(float)  # seconds since recording started
 
-    def __init__(self, seconds, fs=16000, out_wav="data/audio_recordings/clip.wav"):
+    def __init__(self, seconds, fs=None, streams=None, device=None, out_wav=None, track_tempo=False):
         super().__init__()
         self.seconds = seconds
         self.fs = fs
+        self.streams = streams or {}
+        self.device = device
         self.out_wav = out_wav
+        self.track_tempo = track_tempo
+        self.fanout = None
 
     def run(self):
         """The main work function that will be run in the new thread."""
         try:
-            samples = int(self.seconds * self.fs)
-            audio = sd.rec(samples, samplerate=self.fs, channels=1, dtype="float32")
+            fs = self.fs or native_rate(self.device)
+            total = int(self.seconds * fs)
 
-            for i in range(int(self.seconds)):
-                time.sleep(1)
-                self.progress.emit(i + 1)
+            # All blocks land in one preallocated buffer; consumers at the native
+            # rate are handed views into it rather than copies.
+            base = np.zeros(total, dtype=np.float32)
+            self.fanout = ResamplingFanout(fs)
+            for name, rate in self.streams.items():
+                self.fanout.add_consumer(name, rate)
+            if self.track_tempo:
+                tracker = TempoTracker(config.TEMPO_RATE)
+                self.fanout.add_consumer(
+                    "tempo", config.TEMPO_RATE, keep=False,
+                    callback=lambda block: self._emit_tempo_events(tracker.push(block))
+                )
 
-            sd.wait()
-            x = audio.flatten()
-            Path(self.out_wav).parent.mkdir(parents=True, exist_ok=True)
-            write(self.out_wav, self.fs, (x * 32767).astype(np.int16))
-            self.finished.emit((self.fs, x))
+            blocks = queue.Queue()
+            filled = 0
+
+            def callback(indata, frames, time_info, status):
+                nonlocal filled
+                n = min(frames, total - filled)
+                base[filled:filled + n] = indata[:n, 0]
+                blocks.put((filled, filled + n))
+                filled += n
+                if filled >= total:
+                    raise sd.CallbackStop
+
+            seconds_done = 0
+            with sd.InputStream(samplerate=fs, device=self.device, channels=1, dtype="float32",
+                                callback=callback, finished_callback=lambda: blocks.put(None)):
+                while True:
+                    # Resampling happens here, off the real-time audio callback.
+                    item = blocks.get(timeout=self.seconds + 5)
+                    if item is None:
+                        break
+                    a, b = item
+                    self.fanout.push(base[a:b])
+                    if b // fs > seconds_done:
+                        seconds_done = b // fs
+                        self.progress.emit(seconds_done)
+
+            x = base[:filled]
+            # Clips are archived by the controller; a loose WAV is only written on request.
+            if self.out_wav:
+                Path(self.out_wav).parent.mkdir(parents=True, exist_ok=True)
+                write(self.out_wav, fs, (x * 32767).astype(np.int16))
+            self.finished.emit((fs, x, self.fanout.outputs()))
 
         except Exception as e:
             print(f"Error during recording: {e}")
-            self.finished.emit((0, np.array([])))
\ No newline at end of file
+            self.finished.emit((0, np.array([]), {}))
+
+    def _emit_tempo_events(self, events):
+        for event in events:
+            if event["type"] == "tempo":
+                self.tempo_changed.emit(event["bpm"])
+            else:
+                self.beat.emit(event["time"])
@@ -0,0 +1,141 @@
+# File: shazamify/audio/resampler.py
+# Purpose: Streaming polyphase resampling and fan-out of one capture to consumers at different rates.
+
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin, kaiserord
+
+
+class StreamingResampler:
+    """
+    Rational-ratio polyphase FIR resampler that keeps its filter state
+    between blocks, so a stream can be fed in arbitrary-sized chunks and the
+    output is identical to resampling the whole signal at once.
+    """
+
+    def __init__(self, in_rate, out_rate, passband=0.8, atten_db=60.0):
+        g = gcd(int(in_rate), int(out_rate))
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up = self.out_rate // g
+        self.down = self.in_rate // g
+
+        # Low-pass designed at the upsampled rate: flat up to `passband` of the
+        # narrower Nyquist band and `atten_db` down by that Nyquist itself, so
+        # nothing above it can alias back in. The length (in the order of
+        # 20-40 * max(up, down) taps, like resample_poly) follows from the
+        # transition width; it is rounded up so it splits evenly into `up` phases.
+        nyq = 1.0 / max(self.up, self.down)
+        numtaps, beta = kaiserord(atten_db, (1.0 - passband) * nyq)
+        taps_per_phase = -(-numtaps // self.up)
+        cutoff = 0.5 * (1.0 + passband) * nyq
+        h = firwin(taps_per_phase * self.up, cutoff, window=("kaiser", beta)) * self.up
+        # phases[p, k] = h[p + k * up]; reversed so a window of input can be dotted directly.
+        self.phases = h.reshape(taps_per_phase, self.up).T[:, ::-1].astype(np.float32).copy()
+        self.taps = taps_per_phase
+
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._in_pos = 0  # absolute index of the next input sample
+        self._out_pos = 0  # absolute index of the next output sample
+
+    def process(self, block) -> np.ndarray:
+        """Resamples one block and returns however many output samples it completes."""
+        block = np.asarray(block, dtype=np.float32)
+        if self.up == self.down:
+            return block
+
+        buf = np.concatenate((self._history, block))
+        end = self._in_pos + len(block)  # inputs available: [.., end)
+
+        # Output n sits at upsampled position n*down; it needs input base = n*down // up.
+        first = self._out_pos
+        last = -(-end * self.up // self.down)  # first n whose base reaches `end`
+        if last <= first:
+            self._advance(buf, block)
+            return np.empty(0, dtype=np.float32)
+
+        n = np.arange(first, last, dtype=np.int64)
+        pos = n * self.down
+        base = pos // self.up
+        phase = pos % self.up
+
+        # buf[0] is absolute input index (_in_pos - taps + 1), so the window
+        # ending at `base` starts at buf[base - _in_pos].
+        windows = sliding_window_view(buf, self.taps)[base - self._in_pos]
+        y = np.einsum("ij,ij->i", windows, self.phases[phase])
+
+        self._out_pos = last
+        self._advance(buf, block)
+        return y.astype(np.float32, copy=False)
+
+    def _advance(self, buf, block):
+        self._history = buf[len(buf) - (self.taps - 1):].copy()
+        self._in_pos += len(block)
+
+
+class StreamConsumer:
+    """One output of a `ResamplingFanout`: accumulates blocks and optionally forwards them."""
+
+    def __init__(self, name, rate, callback=None, keep=True):
+        self.name = name
+        self.rate = int(rate)
+        self.callback = callback
+        self.keep = keep
+        self.resampler = None
+        self.chunks = []
+
+    def feed(self, block):
+        if self.resampler is not None:
+            block = self.resampler.process(block)
+            if len(block) == 0:
+                return
+        if self.keep:
+            self.chunks.append(block)
+        if self.callback:
+            self.callback(block)
+
+    def read_all(self) -> np.ndarray:
+        if not self.chunks:
+            return np.empty(0, dtype=np.float32)
+        if len(self.chunks) == 1:
+            return self.chunks[0]
+        return np.concatenate(self.chunks)
+
+
+class ResamplingFanout:
+    """
+    Feeds one native-rate input to several consumers. Consumers at the input
+    rate receive the caller's block as-is (a view into the shared capture
+    buffer, never a copy); every other rate gets its own streaming resampler.
+    """
+
+    def __init__(self, in_rate):
+        self.in_rate = int(in_rate)
+        self.consumers = {}
+
+    def add_consumer(self, name, rate=None, callback=None, keep=True) -> StreamConsumer:
+        consumer = StreamConsumer(name, rate or self.in_rate, callback, keep)
+        if consumer.rate != self.in_rate:
+            consumer.resampler = StreamingResampler(self.in_rate, consumer.rate)
+        self.consumers[name] = consumer
+        return consumer
+
+    def push(self, block):
+        for consumer in self.consumers.values():
+            consumer.feed(block)
+
+    def outputs(self) -> dict:
+        """Returns {name: (rate, samples)} for every consumer that keeps its output."""
+        return {
+            name: (c.rate, c.read_all())
+            for name, c in self.consumers.items() if c.keep
+        }
+
+
+
+def native_rate(device=None) -> int:
+    """Returns the default sample rate of an input device (the system default if None)."""
+    import sounddevice as sd  # imported here so resampling works on hosts without PortAudio
+    return int(sd.query_devices(device, "input")["default_samplerate"])
@@ -0,0 +1,186 @@
+# File: shazamify/audio/session_store.py
+# Purpose: Memory-bounded store of this session's recordings and derived features.
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+class SessionStore:
+    """
+    Keeps recordings (and arrays derived from them, e.g. STFT or mel
+    spectrograms) available for instant switching in the Analysis tab.
+
+    Entries are kept in LRU order. While the in-memory arrays exceed
+    `ram_budget` bytes, the least recently used arrays are written to `.npy`
+    files in `spill_dir` and replaced by read-only memory maps, so the OS
+    pages them in on demand instead of the process holding them. Touching a
+    spilled entry loads it back into RAM. Once the spilled files exceed
+    `disk_budget`, the least recently used entries are dropped entirely.
+    The spill directory only lives for the session and is cleared on start.
+    """
+
+    def __init__(self, ram_budget, spill_dir="data/session", disk_budget=None):
+        self.ram_budget = ram_budget
+        self.disk_budget = disk_budget
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.spill_dir.glob("*.npy"):
+            self._unlink(stale)
+
+        self._entries = OrderedDict()  # clip_id -> {"fs": fs, "arrays": {name: ndarray | memmap}}
+        self._lock = threading.RLock()
+        self.ram_bytes = 0
+        self.disk_bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "spills": 0, "promotions": 0, "evictions": 0}
+
+    # --- PUBLIC API ---
+    def put(self, clip_id, fs, x):
+        """Stores a new recording as the most recently used entry."""
+        with self._lock:
+            self._drop(clip_id)
+            self._entries[clip_id] = {"fs": fs, "arrays": {}}
+            self._set(clip_id, "x", x)
+
+    def get(self, clip_id):
+        """Returns (fs, x) for a stored recording, or None if it is not in the store."""
+        with self._lock:
+            entry = self._touch(clip_id)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["hits"] += 1
+            return entry["fs"], entry["arrays"]["x"]
+
+    def feature(self, clip_id, name, compute=None):
+        """
+        Returns a derived array for a stored recording, calling `compute()`
+        and caching the result on a miss.
+        """
+        with self._lock:
+            entry = self._touch(clip_id)
+            if entry is None:
+                raise KeyError(clip_id)
+            if name in entry["arrays"]:
+                self.counters["hits"] += 1
+                return entry["arrays"][name]
+            self.counters["misses"] += 1
+        if compute is None:
+            return None
+
+        # Compute outside the lock; features like chroma can take a while.
+        value = np.asarray(compute())
+        with self._lock:
+            if clip_id in self._entries:
+                self._set(clip_id, name, value)
+        return value
+
+    def __contains__(self, clip_id):
+        with self._lock:
+            return clip_id in self._entries
+
+    def recent(self) -> list:
+        """Clip ids, most recently used first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ram_bytes": self.ram_bytes,
+                "ram_budget": self.ram_budget,
+                "disk_bytes": self.disk_bytes,
+                **self.counters,
+            }
+
+    def clear(self):
+        with self._lock:
+            for clip_id in list(self._entries):
+                self._drop(clip_id)
+
+    # --- INTERNALS (callers hold the lock) ---
+    def _set(self, clip_id, name, value):
+        arrays = self._entries[clip_id]["arrays"]
+        if name in arrays:
+            self._release(clip_id, name, arrays.pop(name))
+        arrays[name] = value
+        self.ram_bytes += value.nbytes
+        self._entries.move_to_end(clip_id)
+        self._enforce_budgets(keep=clip_id)
+
+    def _touch(self, clip_id):
+        entry = self._entries.get(clip_id)
+        if entry is None:
+            return None
+        self._entries.move_to_end(clip_id)
+        spilled = [n for n, a in entry["arrays"].items() if isinstance(a, np.memmap)]
+        for name in spilled:
+            mm = entry["arrays"][name]
+            entry["arrays"][name] = np.array(mm)
+            self.ram_bytes += mm.nbytes
+            self.disk_bytes -= mm.nbytes
+            del mm
+            self._unlink(self._path(clip_id, name))
+        if spilled:
+            self.counters["promotions"] += 1
+            self._enforce_budgets(keep=clip_id)
+        return entry
+
+    def _enforce_budgets(self, keep=None):
+        # Spill least recently used arrays first. The entry being used right
+        # now is spilled last, and only if it alone is over budget.
+        order = [c for c in self._entries if c != keep] + ([keep] if keep in self._entries else [])
+        for clip_id in order:
+            if self.ram_bytes <= self.ram_budget:
+                break
+            arrays = self._entries[clip_id]["arrays"]
+            for name, value in list(arrays.items()):
+                if not isinstance(value, np.memmap):
+                    arrays[name] = self._spill(clip_id, name, value)
+                if self.ram_bytes <= self.ram_budget:
+                    break
+
+        if self.disk_budget is not None:
+            for clip_id in [c for c in self._entries if c != keep]:
+                if self.disk_bytes <= self.disk_budget:
+                    break
+                self._drop(clip_id)
+                self.counters["evictions"] += 1
+
+    def _spill(self, clip_id, name, value):
+        path = self._path(clip_id, name)
+        mm = np.lib.format.open_memmap(path, mode="w+", dtype=value.dtype, shape=value.shape)
+        mm[...] = value
+        mm.flush()
+        del mm
+        self.ram_bytes -= value.nbytes
+        self.disk_bytes += value.nbytes
+        self.counters["spills"] += 1
+        return np.load(path, mmap_mode="r")
+
+    def _drop(self, clip_id):
+        entry = self._entries.pop(clip_id, None)
+        if entry is None:
+            return
+        for name, value in entry["arrays"].items():
+            self._release(clip_id, name, value)
+
+    def _release(self, clip_id, name, value):
+        if isinstance(value, np.memmap):
+            self.disk_bytes -= value.nbytes
+            self._unlink(self._path(clip_id, name))
+        else:
+            self.ram_bytes -= value.nbytes
+
+    def _path(self, clip_id, name):
+        return self.spill_dir / f"{clip_id}_{name}.npy"
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            path.unlink()
+        except OSError:
+            pass  # e.g. Windows keeps files open while something still maps them
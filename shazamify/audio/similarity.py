@@ -0,0 +1,137 @@
+# File: shazamify/audio/similarity.py
+# Purpose: Nearest-neighbour search over clip embeddings ("sounds like" suggestions).
+
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .analyzer import EMBEDDING_DIM
+
+
+class SimilarityIndex:
+    """
+    Exact cosine search over clip embeddings.
+
+    Embeddings are L2-normalized and live in one contiguous float32 matrix
+    (grown by doubling), so a query is a single BLAS matrix-vector product
+    plus a partial sort. That answers in a few milliseconds even at 100k
+    clips, far beyond what an archive holds. (Hashing schemes such as
+    random-projection LSH were slower than this scan on real embeddings,
+    which all point in much the same direction, and lost recall.)
+
+    Each row also carries a "marked" flag (the archive marks clips that were
+    identified) so a query can be limited to marked rows without leaving
+    the single matrix-vector product.
+    """
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self._vectors = np.empty((1024, dim), dtype=np.float32)
+        self._marked = np.zeros(1024, dtype=bool)
+        self.count = 0
+        self.ids = []
+        self._rows = {}  # clip id -> row
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, clip_id):
+        with self._lock:
+            return clip_id in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:self.count]
+
+    # --- BUILDING ---
+    def add(self, clip_id, vector, marked=False):
+        self.add_many([clip_id], np.asarray(vector, dtype=np.float32)[None, :], marked)
+
+    def add_many(self, clip_ids, matrix, marked=False):
+        matrix = self._normalize(np.asarray(matrix, dtype=np.float32))
+        with self._lock:
+            needed = self.count + len(matrix)
+            if needed > len(self._vectors):
+                size = max(needed, 2 * len(self._vectors))
+                grown = np.empty((size, self.dim), dtype=np.float32)
+                grown[:self.count] = self._vectors[:self.count]
+                self._vectors = grown
+                flags = np.zeros(size, dtype=bool)
+                flags[:self.count] = self._marked[:self.count]
+                self._marked = flags
+
+            self._vectors[self.count:needed] = matrix
+            self._marked[self.count:needed] = marked
+            self.ids.extend(clip_ids)
+            for row, clip_id in enumerate(clip_ids, start=self.count):
+                self._rows[clip_id] = row
+            self.count = needed
+
+    def mark(self, clip_id, marked=True):
+        """Sets a clip's marked flag; returns False if the clip is not in the index."""
+        with self._lock:
+            row = self._rows.get(clip_id)
+            if row is None:
+                return False
+            self._marked[row] = marked
+            return True
+
+    # --- QUERYING ---
+    def query(self, vector, k=5, exclude=(), marked_only=False) -> list:
+        """
+        Returns up to k (clip_id, cosine similarity) pairs, best first.
+        With `marked_only`, unmarked clips are skipped.
+        """
+        q = self._normalize(np.asarray(vector, dtype=np.float32)[None, :])[0]
+
+        with self._lock:
+            scores = self._vectors[:self.count] @ q
+            if marked_only:
+                scores[~self._marked[:self.count]] = -np.inf
+            excluded = [self._rows[c] for c in exclude if c in self._rows]
+            if excluded:
+                scores[excluded] = -np.inf
+
+            n = min(k, len(scores))
+            if n <= 0:
+                return []
+            top = np.argpartition(-scores, n - 1)[:n]
+            top = top[np.argsort(-scores[top])]
+            return [(self.ids[i], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def vector(self, clip_id):
+        with self._lock:
+            row = self._rows.get(clip_id)
+            return None if row is None else self._vectors[row].copy()
+
+    # --- PERSISTENCE ---
+    def save(self, path):
+        with self._lock:
+            vectors = self._vectors[:self.count].copy()
+            ids = np.array(self.ids, dtype=str)
+        # Write to a sibling file and swap it in, so a crash mid-save keeps the old index.
+        path = Path(path)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp, vectors=vectors, ids=ids, params=np.array([self.dim]))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            index = cls(int(data["params"][0]))
+            if len(data["ids"]):
+                index.add_many([str(i) for i in data["ids"]], data["vectors"])
+        return index
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        """Loads the index at `path` if it exists, otherwise starts an empty one."""
+        return cls.load(path) if Path(path).exists() else cls(**kwargs)
+
+    # --- HELPERS ---
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
@@ -0,0 +1,177 @@
+# File: shazamify/audio/tempo_tracker.py
+# Purpose: Incremental onset, tempo and beat tracking for live audio blocks.
+
+import numpy as np
+
+
+class TempoTracker:
+    """
+    Live counterpart to `generate_tempogram`.
+
+    Every hop of audio produces one spectral-flux onset value. A sliding
+    autocorrelation over the last `window_seconds` of onsets is updated in
+    place (one add and one subtract per candidate lag), so the cost per
+    frame is constant no matter how long the stream runs. `push()` returns
+    the events the new audio completed:
+
+      {"type": "tempo", "time": s, "bpm": bpm}
+      {"type": "beat", "time": s, "bpm": bpm, "predicted": bool}
+
+    Beats are reported at most a fifth of a beat period after they happen.
+    A beat is "predicted" when no onset peak was found near the expected
+    time and the tracker kept time on its own.
+    """
+
+    def __init__(self, fs, n_fft=1024, hop=256, window_seconds=6.0,
+                 min_bpm=60.0, max_bpm=200.0, start_bpm=120.0, tempo_interval=0.5,
+                 hysteresis=0.8):
+        self.fs = fs
+        self.n_fft = n_fft
+        self.hop = hop
+        self.frame_rate = fs / hop
+        self.window = np.hanning(n_fft).astype(np.float32)
+
+        self.min_lag = max(int(np.floor(60.0 * self.frame_rate / max_bpm)), 1)
+        self.max_lag = int(np.ceil(60.0 * self.frame_rate / min_bpm))
+        self.lags = np.arange(self.min_lag, self.max_lag + 1)
+        # Candidates are scored together with their double, so the autocorrelation
+        # runs to twice the longest lag (plus one for the neighbour of that).
+        self._acf_lags = np.arange(self.min_lag, 2 * self.max_lag + 2)
+        self.win_frames = int(window_seconds * self.frame_rate)
+
+        # Log-normal tempo prior (one octave wide) around start_bpm, as librosa uses.
+        bpms = 60.0 * self.frame_rate / self.lags
+        self.prior = np.exp(-0.5 * np.log2(bpms / start_bpm) ** 2)
+
+        # The ring holds enough history for the window plus its longest lag.
+        self._ring_len = self.win_frames + self._acf_lags[-1] + 1
+        self._onset = np.zeros(self._ring_len)  # mean-removed onset, used for tempo
+        self._flux = np.zeros(self._ring_len)   # raw onset, used for beat picking
+        self._acf = np.zeros(self._acf_lags[-1] + 1)
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._prev_mag = None
+        self._mean = 0.0
+        self._var = 0.0
+        self.frame = 0
+
+        self.bpm = None
+        self._period = None
+        self._last_beat = None
+        self._tempo_every = max(int(tempo_interval * self.frame_rate), 1)
+        self.hysteresis = hysteresis
+
+    def push(self, block) -> list:
+        """Consumes one block of samples and returns any tempo/beat events it completed."""
+        self._pending = np.concatenate((self._pending, np.asarray(block, dtype=np.float32)))
+        events = []
+        while len(self._pending) >= self.n_fft:
+            self._process_frame(self._pending[:self.n_fft], events)
+            self._pending = self._pending[self.hop:]
+        return events
+
+    # --- PER-FRAME UPDATE ---
+    def _process_frame(self, samples, events):
+        mag = np.log1p(100.0 * np.abs(np.fft.rfft(samples * self.window)))
+        flux = 0.0 if self._prev_mag is None else float(np.sum(np.maximum(mag - self._prev_mag, 0.0)))
+        self._prev_mag = mag
+
+        # Running mean/variance (about a 1.5 s time constant) for normalization.
+        alpha = 1.0 / (1.5 * self.frame_rate)
+        self._mean += alpha * (flux - self._mean)
+        self._var += alpha * ((flux - self._mean) ** 2 - self._var)
+        value = flux - self._mean
+
+        t = self.frame
+        R = self._ring_len
+        self._onset[t % R] = value
+        self._flux[t % R] = flux
+
+        # Slide the autocorrelation window: add the pairs ending at t, drop the
+        # pairs ending at t - win_frames.
+        lags = self._acf_lags
+        self._acf[lags] += value * self._onset[(t - lags) % R]
+        old = t - self.win_frames
+        if old >= 0:
+            self._acf[lags] -= self._onset[old % R] * self._onset[(old - lags) % R]
+
+        self.frame += 1
+
+        if t >= self._acf_lags[-1] and t % self._tempo_every == 0:
+            self._update_tempo(events)
+        if self._period is not None:
+            self._track_beats(t, events)
+
+    def _update_tempo(self, events):
+        # A period between two frames splits its autocorrelation peak across
+        # both neighbouring lags, which can hand the win to the (unsplit) peak
+        # at twice the period. Scoring each lag by its better pair of
+        # neighbours measures the whole peak wherever it falls. Each lag also
+        # collects half the peak at its double, so a true beat period (which
+        # repeats at 2L) outscores a lag that only happens to line up with
+        # some of the subdivisions.
+        peaks = self._peak_strength(self.lags) + 0.5 * self._peak_strength(2 * self.lags)
+        scores = peaks * self.prior
+        i = int(np.argmax(scores))
+        if scores[i] <= 0:
+            return
+
+        # With eighth notes present, three subdivisions can sit closer to the
+        # prior than two and win. If 2/3 of the lag has a comparable score,
+        # the lag is a dotted beat; take the shorter one.
+        j = int(round(2 * self.lags[i] / 3)) - self.min_lag
+        if 0 <= j < len(scores) and scores[j] >= 0.5 * scores[i]:
+            i = j
+
+        # Hysteresis: stay on the current period unless another one is clearly
+        # stronger, so the estimate does not hop between tempo octaves.
+        if self._period is not None:
+            j = int(round(self._period)) - self.min_lag
+            if 0 <= j < len(scores) and scores[j] >= self.hysteresis * scores[i]:
+                i = j
+
+        # Sub-frame precision from the centroid of the peak around the chosen lag.
+        L = int(self.lags[i])
+        weights = np.maximum(self._acf[L - 1:L + 2], 0.0)
+        lag = float(np.dot(weights, np.arange(L - 1, L + 2)) / weights.sum()) if weights.any() else float(L)
+
+        self._period = lag
+        self.bpm = round(float(60.0 * self.frame_rate / lag), 1)
+        events.append({"type": "tempo", "time": self._time(self.frame - 1), "bpm": self.bpm})
+
+    def _peak_strength(self, lags):
+        """Autocorrelation at each lag plus its larger neighbour."""
+        acf = self._acf
+        return acf[lags] + np.maximum(acf[lags - 1], acf[lags + 1])
+
+    def _track_beats(self, t, events):
+        R = self._ring_len
+        P = self._period
+        if t < 2:
+            return
+
+        # Frame t-1 is an onset peak if it beats both neighbours and stands out
+        # from the running level.
+        prev2, prev1, cur = self._flux[(t - 2) % R], self._flux[(t - 1) % R], self._flux[t % R]
+        is_peak = prev1 > prev2 and prev1 >= cur and prev1 > self._mean + 0.5 * np.sqrt(max(self._var, 0.0))
+
+        if self._last_beat is None:
+            if is_peak:
+                self._emit_beat(t - 1, False, events)
+            return
+
+        since = (t - 1) - self._last_beat
+        # The window stays inside +-20% so an onset three or five eighth notes
+        # after the last beat can't be taken for the next one.
+        if is_peak and 0.8 * P <= since <= 1.2 * P:
+            self._emit_beat(t - 1, False, events)
+        elif t - self._last_beat > 1.2 * P:
+            # No onset near the expected time; keep the beat going on the clock.
+            self._emit_beat(self._last_beat + P, True, events)
+
+    def _emit_beat(self, frame, predicted, events):
+        self._last_beat = frame
+        events.append({"type": "beat", "time": self._time(frame), "bpm": self.bpm, "predicted": predicted})
+
+    def _time(self, frame):
+        return round(float(frame * self.hop / self.fs), 3)
@@ -0,0 +1,33 @@
+# File: shazamify/config.py
+# Purpose: Application-wide settings shared by the controller and background services.
+
+# --- Recording archive ---
+ARCHIVE_DIR = "data/archive"
+ARCHIVE_FORMAT = "flac"  # "flac" (lossless) or "opus" (smaller, lossy)
+
+# --- Capture ---
+CAPTURE_RATE = None  # None records at the input device's native rate
+RECOGNITION_RATE = 16000  # ACRCloud fingerprints are built from 8-16 kHz audio
+TEMPO_RATE = 11025  # live beat tracking only needs the low end of the spectrum
+
+# --- Headless recognition service ---
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_WORKERS = 4  # concurrent recognitions (one client pair each)
+SERVICE_MAX_QUEUE = 32  # requests waiting beyond this are rejected with 503
+SERVICE_MAX_UPLOAD_MB = 16
+
+# --- Spotify bulk enrichment ---
+SPOTIFY_MAX_WORKERS = 8
+SPOTIFY_CALLS_PER_SECOND = 10  # stays well under Spotify's rolling 30 s rate limit
+
+# --- Multi-room monitoring ---
+MONITOR_WORKERS = 2  # shared analysis/recognition workers across all rooms
+MONITOR_INTERVAL = 15  # seconds between recognition attempts per room
+MONITOR_CLIP_SECONDS = 7
+MONITOR_SILENCE_RMS = 0.005  # quieter clips are analyzed but not sent to ACRCloud
+
+# --- Session history (Analysis tab) ---
+SESSION_RAM_BUDGET_MB = 256  # recent clips and their spectrograms kept in RAM
+SESSION_SPILL_DIR = "data/session"  # older ones are memory-mapped from here
+SESSION_MAX_SPILL_MB = 2048
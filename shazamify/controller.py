@@ -1,9 +1,16 @@
+import time
+
 from PyQt6.QtCore import QObject, QThread
 
+from . import config
 from .services.spotify_client import SpotifyClient
 from .services.recognition_client import RecognitionClient
 from .audio.recorder import Recorder
+from .audio.archive import RecordingArchive
+from .audio.session_store import SessionStore
 from .audio.analyzer import (
+    stft_db,
+    mel_db,
     generate_time_domain,
     generate_magnitude_spectrum,
     generate_chromagram,
@@ -18,12 +25,19 @@ class Controller(QObject):
         self.view = view
         self.spotify_client = SpotifyClient()
         self.recognition_client = RecognitionClient()
-        self.thread = None
-        self.recorder = None
-
-        # Store the current audio data for on-demand plotting
-        self.current_fs = None
-        self.current_x = None
+        # One (thread, recorder) pair per capture flow, so starting one
+        # recording never drops the reference to another that is still running
+        self.workers = {}
+        self.archive = RecordingArchive(config.ARCHIVE_DIR, config.ARCHIVE_FORMAT)
+
+        # Recordings from this session (and their spectrograms) for on-demand
+        # plotting; older ones are spilled to disk to stay under the RAM budget
+        self.session = SessionStore(
+            config.SESSION_RAM_BUDGET_MB * 1024 * 1024,
+            config.SESSION_SPILL_DIR,
+            disk_budget=config.SESSION_MAX_SPILL_MB * 1024 * 1024
+        )
+        self.current_clip_id = None
 
         # --- NEW VARIABLE ---
         self.recognition_duration = 7  # Recognize for 7 seconds
@@ -35,8 +49,8 @@ class Controller(QObject):
         self.view.analysis_tab.record_button_pressed.connect(self.start_audio_analysis)
         # Connect the new signal for generating plots
         self.view.analysis_tab.generate_plot_requested.connect(self.generate_plot)
-
-    # ... (start_song_recognition and on_recognition_clip_finished remain the same)
+        self.view.analysis_tab.load_recording_requested.connect(self.load_recording)
+        self._refresh_recordings_list()
 
     def start_song_recognition(self):
         """
@@ -44,118 +58,175 @@ class Controller(QObject):
         """
         self.view.recognition_tab.set_status_listening()
 
-        # --- THIS IS THE NEW RECORDING LOGIC ---
-        self.thread = QThread()
-        # Use the new duration variable
-        self.recorder = Recorder(seconds=self.recognition_duration)
-        self.recorder.moveToThread(self.thread)
-
-        # When recording finishes, call a new handler method
-        self.recorder.finished.connect(self.on_recognition_clip_finished)
-
-        # Standard thread cleanup
-        self.recorder.finished.connect(self.thread.quit)
-        self.recorder.finished.connect(self.recorder.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-
-        # Start recording
-        self.thread.started.connect(self.recorder.run)
-        self.thread.start()
+        # Capture at the native rate for analysis, with a 16 kHz stream for ACRCloud
+        recorder = Recorder(
+            seconds=self.recognition_duration,
+            fs=config.CAPTURE_RATE,
+            streams={"recognition": config.RECOGNITION_RATE}
+        )
+        self._start_recorder("recognition", recorder, self.on_recognition_clip_finished)
 
     def on_recognition_clip_finished(self, data):
         """
         This method is called ONLY when the recording for song recognition is done.
         """
-        fs, x = data
+        fs, x, streams = data
         if x.size == 0:
             error_details = {"error": "Recording failed."}
             self.view.recognition_tab.update_with_song_details(error_details)
             return
 
-        # Process and display the audio analysis for the recorded clip
-        self._process_and_display_analysis(fs, x)
+        # Archive the clip, then process and display the audio analysis for it
+        clip_id = self.archive.submit(x, fs)
+        self._process_and_display_analysis(clip_id, fs, x)
+        self._refresh_recordings_list()
 
-
-        # The recorder saves the file, so we just need the path.
-        audio_clip_path = "data/audio_recordings/clip.wav"
-
-        # Call our updated recognition client, passing the duration
-        song_title = self.recognition_client.identify_song(
-            audio_clip_path,
+        # Send the samples straight from memory, passing the duration
+        rec_fs, rec_x = streams["recognition"]
+        song_title = self.recognition_client.identify_song_pcm(
+            rec_x, rec_fs,
             rec_duration=self.recognition_duration
         )
 
         if song_title:
-            song_details = self.spotify_client.get_song_details(song_title)
-            
-            # Fetch recommendations if we have an artist ID
-            if "artist_id" in song_details:
-                recommendations = self.spotify_client.get_artist_albums(song_details["artist_id"])
-                song_details.update(recommendations)
-            
+            song_details = self.spotify_client.get_enriched_details(song_title)
+
+            self.archive.set_result(clip_id, song_details)
+            song_details["sounds_like"] = self._sounds_like(clip_id, song_details)
+            self._refresh_recordings_list()
             self.view.recognition_tab.update_with_song_details(song_details)
         else:
             error_details = {"error": "Could not identify song."}
             self.view.recognition_tab.update_with_song_details(error_details)
 
+    def _sounds_like(self, clip_id, song_details, limit=3):
+        """Names of previously identified songs whose recordings sound closest to this clip."""
+        current = song_details.get("song_name")
+        skip = self.archive.clips_of(current) if current else ()
+        names = []
+        for entry, _ in self.archive.similar(clip_id, k=4 * limit, exclude=skip, identified_only=True):
+            name = (entry.get("result") or {}).get("song_name")
+            if name and name not in names:
+                names.append(name)
+        return names[:limit]
+
     def start_audio_analysis(self, duration):
         """Starts a background thread for recording and analysis."""
-        self.thread = QThread()
-        self.recorder = Recorder(seconds=duration)
-        self.recorder.moveToThread(self.thread)
-
-        self.thread.started.connect(self.recorder.run)
-        self.recorder.progress.connect(
+        recorder = Recorder(seconds=duration, fs=config.CAPTURE_RATE, track_tempo=True)
+        recorder.progress.connect(
             lambda sec: self.view.analysis_tab.set_status_recording(sec, duration)
         )
-        self.recorder.finished.connect(self.on_recording_finished)
+        recorder.tempo_changed.connect(self.view.analysis_tab.set_live_tempo)
+        recorder.beat.connect(self.view.analysis_tab.flash_beat)
+        self._start_recorder("analysis", recorder, self.on_recording_finished)
 
-        # Cleanup connections
-        self.recorder.finished.connect(self.thread.quit)
-        self.recorder.finished.connect(self.recorder.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
+    def _start_recorder(self, key, recorder, on_finished):
+        """Runs a Recorder on its own QThread and tracks it under `key` until it finishes."""
+        thread = QThread()
+        recorder.moveToThread(thread)
 
-        self.thread.start()
+        # When recording finishes, call the handler for this flow
+        recorder.finished.connect(on_finished)
+
+        # Standard thread cleanup
+        recorder.finished.connect(thread.quit)
+        recorder.finished.connect(recorder.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self._forget_worker(key, thread))
+
+        thread.started.connect(recorder.run)
+        self.workers[key] = (thread, recorder)
+        thread.start()
+
+    def _forget_worker(self, key, thread):
+        if key in self.workers and self.workers[key][0] is thread:
+            del self.workers[key]
 
     def on_recording_finished(self, data):
         """Handles the audio data once recording is complete."""
-        fs, x = data
+        fs, x, _ = data
         if x.size == 0:
             self.view.analysis_tab.recording_failed()
             return
 
-        self._process_and_display_analysis(fs, x)
+        clip_id = self.archive.submit(x, fs)
+        self._process_and_display_analysis(clip_id, fs, x)
+        self._refresh_recordings_list()
 
-    def _process_and_display_analysis(self, fs, x):
+    def load_recording(self, clip_id):
+        """Switches the Analysis tab to a past recording (from the session if possible)."""
+        data = self._get_audio(clip_id)
+        if data is None:
+            return
+        self._process_and_display_analysis(clip_id, *data)
+
+    def _get_audio(self, clip_id):
+        """Returns (fs, x) from the session store, decoding from the archive on a miss."""
+        data = self.session.get(clip_id)
+        if data is not None:
+            return data
+        try:
+            fs, x = self.archive.read(clip_id)
+        except Exception as e:
+            print(f"Error loading recording {clip_id}: {e}")
+            return None
+        self.session.put(clip_id, fs, x)
+        return fs, x
+
+    def _process_and_display_analysis(self, clip_id, fs, x):
         """
         Stores the audio data and resets the UI for on-demand plotting.
         """
-        self.current_fs = fs
-        self.current_x = x
-        
+        if clip_id not in self.session:
+            self.session.put(clip_id, fs, x)
+        self.current_clip_id = clip_id
+
         # Tell the view that new data is available and reset the buttons
         self.view.analysis_tab.reset_plots_state()
 
+    def _refresh_recordings_list(self):
+        """Pushes the archive index to the Analysis tab's history selector."""
+        items = []
+        for entry in self.archive.entries():
+            label = f"{time.strftime('%b %d %H:%M:%S', time.localtime(entry['timestamp']))} ({entry['duration']:.0f}s)"
+            result = entry.get("result") or {}
+            if "song_name" in result:
+                label += f" - {result['song_name']}"
+            items.append((entry["id"], label))
+        self.view.analysis_tab.set_recordings(items, selected=self.current_clip_id)
+
+    def shutdown(self):
+        """Waits for background work (e.g. archive encoding) before the app exits."""
+        self.archive.close()
+        self.session.clear()
+
     def generate_plot(self, plot_type):
         """
         Generates a specific plot on demand.
         """
-        if self.current_x is None or self.current_fs is None:
+        if self.current_clip_id is None:
+            return
+        clip_id = self.current_clip_id
+        data = self._get_audio(clip_id)
+        if data is None:
             return
+        fs, x = data
 
         path = None
         if plot_type == "time":
-            path = generate_time_domain(self.current_x, self.current_fs)
+            path = generate_time_domain(x, fs)
         elif plot_type == "spectrum":
-            path = generate_magnitude_spectrum(self.current_x, self.current_fs)
+            path = generate_magnitude_spectrum(x, fs)
         elif plot_type == "chroma":
-            path = generate_chromagram(self.current_x, self.current_fs)
+            path = generate_chromagram(x, fs)
         elif plot_type == "spectrogram":
-            path = generate_spectrogram(self.current_x, self.current_fs)
+            Xdb = self.session.feature(clip_id, "stft_db", lambda: stft_db(x))
+            path = generate_spectrogram(x, fs, Xdb=Xdb)
         elif plot_type == "mel":
-            path = generate_mel_spectrogram(self.current_x, self.current_fs)
+            S_dB = self.session.feature(clip_id, "mel_db", lambda: mel_db(x, fs))
+            path = generate_mel_spectrogram(x, fs, S_dB=S_dB)
         elif plot_type == "tempogram":
-            path = generate_tempogram(self.current_x, self.current_fs)
+            path = generate_tempogram(x, fs)
         
         if path:
             self.view.analysis_tab.display_single_plot(plot_type, path)
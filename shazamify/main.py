@@ -26,7 +26,9 @@ def run_application():
 
     # 3. Show the main window and start the application loop
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    controller.shutdown()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,83 @@
+# File: shazamify/monitor.py
+# Purpose: Headless entry point that recognizes music in several rooms (input devices) at once.
+#
+# Usage: python shazamify/monitor.py --room lobby=1 --room bar=3 [--workers 2] [--interval 15]
+#        python shazamify/monitor.py --list-devices
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to sys.path to allow absolute imports from the shazamify package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sounddevice as sd
+
+from shazamify import config
+from shazamify.audio.multi_capture import MultiRoomMonitor
+from shazamify.services.recognition_pipeline import RecognitionPipeline
+
+
+def parse_rooms(specs):
+    """Turns ["lobby=1", "bar=USB Audio"] into {"lobby": 1, "bar": "USB Audio"}."""
+    rooms = {}
+    for spec in specs:
+        name, _, device = spec.partition("=")
+        if not device:
+            raise SystemExit(f"Invalid --room '{spec}', expected NAME=DEVICE.")
+        rooms[name] = int(device) if device.isdigit() else device
+    return rooms
+
+
+def print_result(name, state):
+    details = state.get("song_details") or {}
+    if state["status"] == "done":
+        print(f"[{name}] {details['artist(s)']} - {details['song_name']}")
+    elif state["status"] == "no match":
+        print(f"[{name}] {details.get('error', 'No match.')}")
+    else:
+        print(f"[{name}] {state['status']}")
+
+
+def print_stats(stats):
+    print(f"--- pool: {stats['workers']} workers, {stats['in_flight']} busy, {stats['queue_depth']} waiting")
+    for name, s in stats["streams"].items():
+        print(f"    {name}: {s['fs']} Hz x{s['realtime_ratio']:.2f} realtime, "
+              f"{s['jobs_completed']}/{s['jobs_submitted']} jobs done, {s['jobs_dropped']} dropped, "
+              f"{s['overflows']} overflows, {s['avg_job_s']:.1f}s avg")
+
+
+def run_monitor():
+    parser = argparse.ArgumentParser(description="Recognize music from several input devices at once.")
+    parser.add_argument("--room", action="append", default=[], help="NAME=DEVICE (index or name); repeatable")
+    parser.add_argument("--workers", type=int, default=config.MONITOR_WORKERS)
+    parser.add_argument("--interval", type=float, default=config.MONITOR_INTERVAL)
+    parser.add_argument("--stats-every", type=float, default=60, help="seconds between stats reports")
+    parser.add_argument("--list-devices", action="store_true")
+    args = parser.parse_args()
+
+    if args.list_devices:
+        print(sd.query_devices())
+        return
+    rooms = parse_rooms(args.room)
+    if not rooms:
+        parser.error("at least one --room is required")
+
+    pipeline = RecognitionPipeline(size=args.workers)
+    monitor = MultiRoomMonitor(rooms, pipeline, workers=args.workers,
+                               interval=args.interval, on_result=print_result)
+    monitor.start()
+    try:
+        while True:
+            time.sleep(args.stats_every)
+            print_stats(monitor.stats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.stop()
+        print_stats(monitor.stats())
+
+
+if __name__ == '__main__':
+    run_monitor()
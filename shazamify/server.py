@@ -0,0 +1,182 @@
+# File: shazamify/server.py
+# Purpose: Headless HTTP service that identifies uploaded clips and returns Spotify details as JSON.
+
+import asyncio
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to sys.path to allow absolute imports from the shazamify package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import soundfile as sf
+from aiohttp import web
+
+from shazamify import config
+from shazamify.services.recognition_pipeline import RecognitionPipeline
+
+
+def decode_upload(body: bytes, content_type: str, query) -> tuple:
+    """
+    Turns a request body into (fs, x) mono float32 samples.
+
+    WAV (or any container libsndfile understands) is decoded as-is. Raw PCM
+    is sent as application/octet-stream with `rate` and optionally
+    `format=s16le|f32le` in the query string.
+    """
+    if not body:
+        raise ValueError("Empty upload.")
+
+    if content_type in ("application/octet-stream", "audio/l16", "audio/pcm"):
+        if "rate" not in query:
+            raise ValueError("Raw PCM uploads need a 'rate' query parameter.")
+        fs = int(query["rate"])
+        if fs <= 0:
+            raise ValueError(f"Invalid sample rate {fs}.")
+        fmt = query.get("format", "s16le")
+        if fmt == "s16le":
+            x = np.frombuffer(body, dtype="<i2").astype(np.float32) / 32768.0
+        elif fmt == "f32le":
+            x = np.frombuffer(body, dtype="<f4").astype(np.float32)
+        else:
+            raise ValueError(f"Unsupported PCM format '{fmt}'.")
+        return fs, x
+
+    try:
+        x, fs = sf.read(io.BytesIO(body), dtype="float32", always_2d=True)
+    except Exception as e:
+        raise ValueError(f"Could not decode audio: {e}")
+    return fs, x.mean(axis=1)
+
+
+class RecognitionService:
+    """
+    Queues recognition jobs and runs them on a bounded worker pool.
+
+    Requests wait in an asyncio queue of at most `max_queue` entries; when it
+    is full the request is rejected straight away with 503 instead of piling
+    up. Each of the `workers` consumer tasks hands one job at a time to a
+    thread pool of the same size, where the blocking API calls run.
+    """
+
+    def __init__(self, pipeline, workers=4, max_queue=32):
+        self.pipeline = pipeline
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue = None
+        self.executor = None
+        self._tasks = []
+
+        self.in_flight = 0
+        self.counters = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0, "bad_request": 0}
+        self.latencies = deque(maxlen=1024)  # seconds from enqueue to response
+        self.started_at = time.time()
+
+    # --- LIFECYCLE ---
+    async def start(self, app):
+        self.queue = asyncio.Queue(self.max_queue)
+        self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="recognition")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, app):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            x, fs, duration, future, enqueued = await self.queue.get()
+            self.in_flight += 1
+            try:
+                result = await loop.run_in_executor(
+                    self.executor, self.pipeline.recognize, x, fs, duration
+                )
+                self.counters["completed"] += 1
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                self.counters["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.in_flight -= 1
+                self.latencies.append(time.monotonic() - enqueued)
+                self.queue.task_done()
+
+    # --- HANDLERS ---
+    async def handle_recognize(self, request):
+        body = await request.read()
+        try:
+            fs, x = decode_upload(body, request.content_type, request.query)
+            duration = int(request.query.get("duration", 10))
+            if duration <= 0:
+                raise ValueError(f"Invalid duration {duration}.")
+        except ValueError as e:
+            self.counters["bad_request"] += 1
+            return web.json_response({"error": str(e)}, status=400)
+
+        duration = min(duration, max(int(len(x) / fs), 1))
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((x, fs, duration, future, time.monotonic()))
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            return web.json_response(
+                {"error": "Server busy, try again."}, status=503, headers={"Retry-After": "1"}
+            )
+        self.counters["accepted"] += 1
+
+        try:
+            result = await future
+        except Exception as e:
+            return web.json_response({"error": f"Recognition failed: {e}"}, status=500)
+        return web.json_response(result)
+
+    async def handle_metrics(self, request):
+        return web.json_response(self.metrics())
+
+    def metrics(self) -> dict:
+        lat = sorted(self.latencies)
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            **self.counters,
+            "cache_hits": self.pipeline.cache_hits,
+            "cache_misses": self.pipeline.cache_misses,
+            "latency_p50_ms": round(lat[len(lat) // 2] * 1000, 1) if lat else None,
+            "latency_p95_ms": round(lat[int(len(lat) * 0.95)] * 1000, 1) if lat else None,
+        }
+
+
+SERVICE_KEY = web.AppKey("service", RecognitionService)
+
+
+def create_app(pipeline, workers=config.SERVICE_WORKERS, max_queue=config.SERVICE_MAX_QUEUE):
+    """Builds the aiohttp application around an existing pipeline."""
+    service = RecognitionService(pipeline, workers=workers, max_queue=max_queue)
+    app = web.Application(client_max_size=config.SERVICE_MAX_UPLOAD_MB * 1024 * 1024)
+    app[SERVICE_KEY] = service
+    app.on_startup.append(service.start)
+    app.on_cleanup.append(service.stop)
+    app.router.add_post("/recognize", service.handle_recognize)
+    app.router.add_get("/metrics", service.handle_metrics)
+    return app
+
+
+def run_server():
+    """Starts the service with real ACRCloud and Spotify clients."""
+    pipeline = RecognitionPipeline(size=config.SERVICE_WORKERS)
+    web.run_app(create_app(pipeline), host=config.SERVICE_HOST, port=config.SERVICE_PORT)
+
+
+if __name__ == '__main__':
+    run_server()
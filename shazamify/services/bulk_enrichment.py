@@ -0,0 +1,247 @@
+# File: shazamify/services/bulk_enrichment.py
+# Purpose: Enriches many identified songs at once using Spotify's batched endpoints.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import spotipy
+
+from .. import config
+
+# Spotify's multi-ID endpoints (/tracks, /artists) accept at most 50 IDs per call.
+MAX_IDS_PER_CALL = 50
+
+
+def _batches(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+class RateLimiter:
+    """Token bucket shared by every worker thread."""
+
+    def __init__(self, calls_per_second, burst=None):
+        self.rate = calls_per_second
+        self.capacity = burst or calls_per_second
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class BulkEnricher:
+    """
+    Bulk counterpart to SpotifyClient.get_enriched_details.
+
+    Input items are dicts with a "song_title" ("Artist - Title") and, when
+    known, a "track_id"; any other keys (e.g. a clip id) are passed through.
+    Items are processed in chunks of 50 and each chunk's records are yielded
+    as soon as it is done:
+
+      * known track IDs are fetched with /tracks, 50 per call;
+      * unknown tracks are searched concurrently, once per distinct title;
+      * primary artists are fetched with /artists, 50 per call (for genres);
+      * albums are fetched once per distinct artist, concurrently.
+
+    Results are cached for the lifetime of the enricher, so repeated songs
+    and artists across chunks cost nothing. `report()` compares the calls
+    made with what the single-song path would have needed for the same songs.
+    """
+
+    def __init__(self, spotify_client, max_workers=config.SPOTIFY_MAX_WORKERS,
+                 calls_per_second=config.SPOTIFY_CALLS_PER_SECOND, album_limit=3):
+        if not spotify_client.sp:
+            raise ValueError("Spotify client not initialized.")
+        self.auth_manager = spotify_client.sp.auth_manager
+        self.max_workers = max_workers
+        self.album_limit = album_limit
+        self.limiter = RateLimiter(calls_per_second)
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.stats = {"records": 0, "not_found": 0, "search": 0, "tracks": 0, "artists": 0, "artist_albums": 0}
+
+        self._tracks = {}    # track id -> track object
+        self._searches = {}  # normalized title -> track id, or None if not found
+        self._artists = {}   # artist id -> artist object
+        self._albums = {}    # artist id -> list of album names
+
+    # --- PUBLIC API ---
+    def enrich(self, items):
+        """Yields one enriched record per input item, in input order."""
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix="spotify-bulk") as executor:
+            chunk = []
+            for item in items:
+                chunk.append({"song_title": item} if isinstance(item, str) else item)
+                if len(chunk) == MAX_IDS_PER_CALL:
+                    yield from self._enrich_chunk(chunk, executor)
+                    chunk = []
+            if chunk:
+                yield from self._enrich_chunk(chunk, executor)
+
+    def report(self) -> dict:
+        """
+        API calls made versus the per-song path, which makes one search per
+        song plus one artist_albums call when the search finds a track.
+        Genre lookups (/artists) have no per-song counterpart, so they are
+        reported separately and left out of `calls_saved`.
+        """
+        calls = sum(v for k, v in self.stats.items() if k not in ("records", "not_found"))
+        genre_calls = self.stats["artists"]
+        per_song = 2 * self.stats["records"] - self.stats["not_found"]
+        return {
+            **self.stats,
+            "calls_made": calls,
+            "genre_calls": genre_calls,
+            "per_song_calls": per_song,
+            "calls_saved": per_song - (calls - genre_calls),
+        }
+
+    # --- CHUNK PROCESSING ---
+    def _enrich_chunk(self, chunk, executor):
+        # 1. Resolve every item to a track.
+        want_ids = list({i["track_id"] for i in chunk if i.get("track_id")} - self._tracks.keys())
+        for batch in _batches(want_ids, MAX_IDS_PER_CALL):
+            try:
+                found = self._call("tracks", lambda sp: sp.tracks(batch))["tracks"]
+            except Exception as e:
+                print(f"Spotify track lookup failed, falling back to search: {e}")
+                continue
+            for track in found:
+                if track:
+                    self._tracks[track["id"]] = track
+
+        titles = {}
+        for i in chunk:
+            if i.get("track_id") in self._tracks:
+                continue
+            key = self._key(i["song_title"])
+            if key not in self._searches:
+                titles.setdefault(key, i["song_title"])
+        for key, track in zip(titles, executor.map(self._search, titles.values())):
+            if track is False:
+                continue  # request failed; leave uncached so a later chunk can retry
+            self._searches[key] = track["id"] if track else None
+            if track:
+                self._tracks[track["id"]] = track
+
+        tracks = [self._track_for(i) for i in chunk]
+
+        # 2. Fetch each new primary artist once.
+        artist_ids = list({t["artists"][0]["id"] for t in tracks if t} - self._artists.keys())
+        for batch in _batches(artist_ids, MAX_IDS_PER_CALL):
+            try:
+                found = self._call("artists", lambda sp: sp.artists(batch))["artists"]
+            except Exception as e:
+                print(f"Spotify artist lookup failed: {e}")
+                continue
+            for artist in found:
+                if artist:
+                    self._artists[artist["id"]] = artist
+
+        album_ids = [a for a in {t["artists"][0]["id"] for t in tracks if t} if a not in self._albums]
+        for artist_id, albums in zip(album_ids, executor.map(self._artist_albums, album_ids)):
+            self._albums[artist_id] = albums
+
+        # 3. Build the records.
+        for item, track in zip(chunk, tracks):
+            record = self._record(item, track)
+            with self._stats_lock:
+                self.stats["records"] += 1
+                if "error" in record:
+                    self.stats["not_found"] += 1
+            yield {**item, **record}
+
+    def _track_for(self, item):
+        track_id = item.get("track_id")
+        if track_id and track_id in self._tracks:
+            return self._tracks[track_id]
+        found = self._searches.get(self._key(item["song_title"]))
+        return self._tracks.get(found) if found else None
+
+    def _record(self, item, track) -> dict:
+        if track is None:
+            return {"error": f"No results found for '{item['song_title']}'."}
+        artist_id = track["artists"][0]["id"]
+        artist = self._artists.get(artist_id, {})
+        return {
+            "song_name": track["name"],
+            "track_id": track["id"],
+            "artist(s)": ', '.join([a["name"] for a in track["artists"]]),
+            "artist_id": artist_id,
+            "album_name": track["album"]["name"],
+            "album_art_url": track["album"]["images"][0]["url"] if track["album"]["images"] else '',
+            "top_albums": self._albums.get(artist_id, []),
+            "genres": artist.get("genres", []),
+        }
+
+    # --- API CALLS (run on worker threads) ---
+    def _search(self, song_title):
+        try:
+            result = self._call("search", lambda sp: sp.search(q=song_title, type='track', limit=1))
+            items = result['tracks']['items']
+            return items[0] if items else None
+        except Exception as e:
+            print(f"Spotify search failed for '{song_title}': {e}")
+            return False
+
+    def _artist_albums(self, artist_id):
+        try:
+            albums = self._call(
+                "artist_albums",
+                lambda sp: sp.artist_albums(artist_id, album_type='album', limit=self.album_limit)
+            )
+            return [a['name'] for a in albums['items']]
+        except Exception as e:
+            print(f"Spotify album lookup failed for artist {artist_id}: {e}")
+            return []
+
+    def _call(self, endpoint, fn):
+        self.limiter.acquire()
+        with self._stats_lock:
+            self.stats[endpoint] += 1
+        return fn(self._sp())
+
+    def _sp(self):
+        # spotipy clients share a requests.Session, so each thread gets its own,
+        # all backed by the same token manager.
+        sp = getattr(self._local, "sp", None)
+        if sp is None:
+            sp = self._local.sp = spotipy.Spotify(auth_manager=self.auth_manager)
+        return sp
+
+    @staticmethod
+    def _key(song_title):
+        return " ".join(song_title.casefold().split())
+
+
+def reenrich_archive(archive, enricher):
+    """Re-runs Spotify enrichment for every identified clip in a RecordingArchive."""
+    items = []
+    for entry in archive.entries():
+        result = entry.get("result") or {}
+        if "song_name" in result:
+            items.append({
+                "clip_id": entry["id"],
+                "song_title": f"{result['artist(s)']} - {result['song_name']}",
+                "track_id": result.get("track_id"),
+            })
+
+    for record in enricher.enrich(items):
+        clip_id = record.pop("clip_id")
+        record.pop("song_title")
+        if "error" not in record:
+            archive.set_result(clip_id, record)
+    return enricher.report()
@@ -1,9 +1,12 @@
 # File: shazamify/services/recognition_client.py
 
+import io
 import os
 import json
 import pathlib
+import numpy as np
 from dotenv import load_dotenv
+from scipy.io.wavfile import write
 
 
 from acrcloud.recognizer import ACRCloudRecognizer
@@ -58,21 +61,48 @@ class RecognitionClient:
                 rec_length=rec_duration
             )
 
-            result_json = json.loads(result_string)
+            return self._parse_result(result_string)
 
-            if result_json.get('status', {}).get('code') == 0:
-                music_info = result_json['metadata']['music'][0]
-                title = music_info.get('title', 'Unknown Title')
-                artists = music_info.get('artists', [])
-                artist_names = ', '.join([artist.get('name', '') for artist in artists])
+        except Exception as e:
+            print(f"An error occurred during song recognition: {e}")
+            return None
+
+    def identify_song_pcm(self, x, fs: int, rec_duration: int = 10) -> str | None:
+        """
+        Identifies a song from in-memory float samples, so no temporary
+        WAV file has to be written first.
+        """
+        if not self.recognizer:
+            print("Recognition client not initialized.")
+            return None
 
-                print(f"Successfully identified: {artist_names} - {title}")
-                return f"{artist_names} - {title}"
-            else:
-                error_message = result_json.get('status', {}).get('msg', 'Unknown error')
-                print(f"No result found from ACRCloud: {error_message}")
-                return None
+        try:
+            buf = io.BytesIO()
+            write(buf, int(fs), (np.clip(x, -1.0, 1.0) * 32767).astype(np.int16))
+            result_string = self.recognizer.recognize_by_filebuffer(
+                buf.getvalue(),
+                0,
+                rec_duration
+            )
+            return self._parse_result(result_string)
 
         except Exception as e:
             print(f"An error occurred during song recognition: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def _parse_result(self, result_string: str) -> str | None:
+        """Turns an ACRCloud JSON response into an "Artist - Title" string."""
+        result_json = json.loads(result_string)
+
+        if result_json.get('status', {}).get('code') == 0:
+            music_info = result_json['metadata']['music'][0]
+            title = music_info.get('title', 'Unknown Title')
+            artists = music_info.get('artists', [])
+            artist_names = ', '.join([artist.get('name', '') for artist in artists])
+
+            print(f"Successfully identified: {artist_names} - {title}")
+            return f"{artist_names} - {title}"
+        else:
+            error_message = result_json.get('status', {}).get('msg', 'Unknown error')
+            print(f"No result found from ACRCloud: {error_message}")
+            return None
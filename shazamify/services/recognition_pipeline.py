@@ -0,0 +1,77 @@
+# File: shazamify/services/recognition_pipeline.py
+# Purpose: Thread-safe "identify, then enrich" flow shared by headless services.
+
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .recognition_client import RecognitionClient
+from .spotify_client import SpotifyClient
+
+
+class RecognitionPipeline:
+    """
+    Runs RecognitionClient + SpotifyClient enrichment from any number of
+    worker threads.
+
+    Neither client is safe to share between threads (both hold an HTTP
+    session), so the pipeline keeps a pool of client pairs that are created
+    once and checked out per request. Spotify enrichment is cached by song
+    title across all requests, since many listeners hear the same songs.
+    """
+
+    def __init__(self, size=4, recognition_factory=RecognitionClient,
+                 spotify_factory=SpotifyClient, cache_size=1024):
+        self.size = size
+        self._clients = queue.Queue()
+        for _ in range(size):
+            self._clients.put((recognition_factory(), spotify_factory()))
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @contextmanager
+    def clients(self):
+        """Checks out a (recognition, spotify) client pair for the current thread."""
+        pair = self._clients.get()
+        try:
+            yield pair
+        finally:
+            self._clients.put(pair)
+
+    def recognize(self, x, fs, rec_duration=10) -> dict:
+        """Identifies a clip and returns its song details, or a dict with an "error" key."""
+        with self.clients() as (recognition_client, spotify_client):
+            song_title = recognition_client.identify_song_pcm(x, fs, rec_duration=rec_duration)
+            if not song_title:
+                return {"error": "Could not identify song."}
+            return self.enrich(song_title, spotify_client)
+
+    def enrich(self, song_title, spotify_client=None) -> dict:
+        """Returns cached Spotify details for a title, fetching them on a miss."""
+        with self._cache_lock:
+            details = self._cache.get(song_title)
+            if details is not None:
+                self._cache.move_to_end(song_title)
+                self.cache_hits += 1
+                return dict(details)
+            self.cache_misses += 1
+
+        if spotify_client is None:
+            with self.clients() as (_, spotify_client):
+                details = spotify_client.get_enriched_details(song_title)
+        else:
+            details = spotify_client.get_enriched_details(song_title)
+
+        # Errors are usually transient (rate limits, timeouts), so don't cache them.
+        if "error" not in details:
+            with self._cache_lock:
+                self._cache[song_title] = details
+                self._cache.move_to_end(song_title)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return dict(details)
@@ -38,6 +38,7 @@ class SpotifyClient:
             artist = track['artists'][0]
             return {
                 "song_name": track['name'],
+                "track_id": track['id'],
                 "artist(s)": ', '.join([a['name'] for a in track['artists']]),
                 "artist_id": artist['id'],
                 "album_name": track['album']['name'],
@@ -61,4 +62,14 @@ class SpotifyClient:
 
         return {
             "top_albums": top_albums
-        }
\ No newline at end of file
+        }
+
+    def get_enriched_details(self, song_title: str) -> dict:
+        """Song details plus the artist's top albums, as shown on the recognition tab."""
+        song_details = self.get_song_details(song_title)
+
+        # Fetch recommendations if we have an artist ID
+        if "artist_id" in song_details:
+            song_details.update(self.get_artist_albums(song_details["artist_id"]))
+
+        return song_details
@@ -3,9 +3,9 @@
 from functools import partial
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QGridLayout, 
-    QApplication, QScrollArea, QFrame, QSizePolicy, QStackedWidget
+    QApplication, QScrollArea, QFrame, QSizePolicy, QStackedWidget, QComboBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QPixmap, QFont
 
 class ResizableImageLabel(QLabel):
@@ -101,6 +101,7 @@ class AnalysisTab(QWidget):
     """UI for the audio recording and visualization feature."""
     record_button_pressed = pyqtSignal(float)
     generate_plot_requested = pyqtSignal(str) # plot_type
+    load_recording_requested = pyqtSignal(str) # archive clip id
 
     def __init__(self):
         super().__init__()
@@ -147,6 +148,28 @@ class AnalysisTab(QWidget):
         self.record_button.setCursor(Qt.CursorShape.PointingHandCursor)
         self.record_button.clicked.connect(lambda: self.record_button_pressed.emit(self.selected_duration))
 
+        # Live tempo readout, updated while recording
+        self.tempo_label = QLabel("")
+        self.tempo_label.setFont(QFont("Arial", 18)); self.tempo_label.setStyleSheet("color: #cccccc;")
+        self.tempo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.beat_indicator = QLabel("●")
+        self.beat_indicator.setFont(QFont("Arial", 18)); self.beat_indicator.setStyleSheet("color: #333;")
+        tempo_layout = QHBoxLayout(); tempo_layout.addStretch()
+        tempo_layout.addWidget(self.beat_indicator); tempo_layout.addWidget(self.tempo_label); tempo_layout.addStretch()
+
+        # --- PAST RECORDINGS ---
+        history_layout = QHBoxLayout(); history_layout.setSpacing(15)
+        self.history_combo = QComboBox()
+        self.history_combo.setStyleSheet("QComboBox { background-color: #555; color: white; padding: 8px; border-radius: 5px; }")
+        self.history_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.load_button = QPushButton("Load")
+        self.load_button.setStyleSheet("""
+            QPushButton { background-color: #444; color: white; padding: 8px 20px; border-radius: 5px; }
+            QPushButton:hover { background-color: #666; }
+        """)
+        self.load_button.clicked.connect(self._on_load_clicked)
+        history_layout.addWidget(QLabel("Past recordings:")); history_layout.addWidget(self.history_combo); history_layout.addWidget(self.load_button)
+
         # --- PLOTS LIST (Single Column) ---
         plots_layout = QVBoxLayout()
         plots_layout.setSpacing(30)
@@ -172,6 +195,8 @@ class AnalysisTab(QWidget):
         main_layout.addWidget(description, alignment=Qt.AlignmentFlag.AlignCenter)
         main_layout.addLayout(duration_layout)
         main_layout.addLayout(button_layout)
+        main_layout.addLayout(tempo_layout)
+        main_layout.addLayout(history_layout)
         main_layout.addLayout(plots_layout)
         
         # Add content widget to scroll area
@@ -199,7 +224,29 @@ class AnalysisTab(QWidget):
     def recording_failed(self):
         self.record_button.setText("🎤 Record Audio"); self.record_button.setEnabled(True)
 
+    def set_live_tempo(self, bpm):
+        self.tempo_label.setText(f"Live tempo: {bpm:.0f} BPM")
+
+    def flash_beat(self, _time=None):
+        self.beat_indicator.setStyleSheet("color: #e94560;")
+        QTimer.singleShot(100, lambda: self.beat_indicator.setStyleSheet("color: #333;"))
+
+    def set_recordings(self, items, selected=None):
+        """Fills the past-recordings selector with (clip_id, label) pairs, keeping `selected` chosen."""
+        self.history_combo.clear()
+        for clip_id, label in items:
+            self.history_combo.addItem(label, clip_id)
+        index = self.history_combo.findData(selected) if selected else -1
+        if index >= 0:
+            self.history_combo.setCurrentIndex(index)
+        self.load_button.setEnabled(bool(items))
+
     # --- HELPER METHODS ---
+    def _on_load_clicked(self):
+        clip_id = self.history_combo.currentData()
+        if clip_id:
+            self.load_recording_requested.emit(clip_id)
+
     def set_duration(self, duration):
         self.selected_duration = duration
         self.update_duration_buttons_style()
@@ -56,7 +56,13 @@ class RecognitionTab(QWidget):
         self.top_albums_label.setStyleSheet("color: #cccccc;")
         self.top_albums_label.setWordWrap(True)
 
+        self.sounds_like_label = QLabel("")
+        self.sounds_like_label.setFont(QFont("Arial", 18))
+        self.sounds_like_label.setStyleSheet("color: #cccccc;")
+        self.sounds_like_label.setWordWrap(True)
+
         self.recommendations_layout.addWidget(self.top_albums_label)
+        self.recommendations_layout.addWidget(self.sounds_like_label)
 
         right_layout.addStretch(1)
         right_layout.addWidget(self.song_label); right_layout.addWidget(self.artist_label)
@@ -71,7 +77,7 @@ class RecognitionTab(QWidget):
     def set_status_listening(self):
         self.song_label.setText("🎵 Listening..."); self.artist_label.setText("Analyzing audio...")
         self.album_label.setText(""); self.listen_button.setEnabled(False)
-        self.top_albums_label.setText("")
+        self.top_albums_label.setText(""); self.sounds_like_label.setText("")
         self.listen_button.setText("⏳ Processing...")
         QApplication.processEvents()
 
@@ -79,7 +85,7 @@ class RecognitionTab(QWidget):
         if "error" in details:
             self.song_label.setText(f"❌ {details['error']}"); self.artist_label.setText("Please try again.")
             self.album_label.setText(""); self.set_album_art_pixmap(self.default_pixmap)
-            self.top_albums_label.setText("")
+            self.top_albums_label.setText(""); self.sounds_like_label.setText("")
         else:
             self.song_label.setText(details['song_name']); self.artist_label.setText(f"by {details['artist(s)']}")
             self.album_label.setText(details['album_name']); self.update_album_art(details['album_art_url'])
@@ -89,6 +95,11 @@ class RecognitionTab(QWidget):
                 albums_str = ", ".join(details["top_albums"])
                 self.top_albums_label.setText(f"<b>More from this Artist:</b> {albums_str}")
 
+            if details.get("sounds_like"):
+                self.sounds_like_label.setText(f"<b>Sounds like:</b> {', '.join(details['sounds_like'])}")
+            else:
+                self.sounds_like_label.setText("")
+
         self.listen_button.setEnabled(True); self.listen_button.setText("🎧 Listen")
 
     # --- HELPER METHODS ---